@@ -1,5 +1,16 @@
-__all__ = ["scrape"]
+__all__ = ["scrape", "scrape_school", "sparse_encode"]
 
-from collegedatascraper.collegedatascraper import scrape
+from collegedatascraper.collegedatascraper import scrape, scrape_school
 
 name = 'collegedatascraper'
+
+
+def __getattr__(attr):
+    """Import sparse_encode on first use, so that importing the package to
+    run scrape_school does not import pandas."""
+
+    if attr == 'sparse_encode':
+        from collegedatascraper.encoders import sparse_encode
+        return sparse_encode
+
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
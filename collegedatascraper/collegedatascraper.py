@@ -1,18 +1,28 @@
 import json
+import math
+import os
+import time
+import collections
+import concurrent.futures
 import requests
 import bs4
 import logging
-import pandas as pd
 
 from collegedatascraper.reformatters import reformat_soup
-from collegedatascraper.extractors import extract_series
+from collegedatascraper.extractors import extract_record
 
 ##############################################################################
 # CONFIGURATION
 ##############################################################################
 
 
-with open('config.json', 'r') as f:
+# Use a config.json in the working directory, else the one in the repo.
+config_path = 'config.json'
+if not os.path.exists(config_path):
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    config_path = os.path.join(package_dir, os.pardir, 'config.json')
+
+with open(config_path, 'r') as f:
     config = json.load(f)
 
 url_pt1 = config['URL']['PART1']
@@ -20,6 +30,12 @@ url_pt2 = config['URL']['PART2']
 headers = config['HEADERS']
 empty_h1_string = config['EMPTY_H1']
 na_vals = config['NA_VALS']
+timeout = (config['TIMEOUT']['CONNECT'], config['TIMEOUT']['READ'])
+hedge_percentile = config['HEDGE']['PERCENTILE']
+hedge_min_samples = config['HEDGE']['MIN_SAMPLES']
+
+# Latencies (in seconds) of recent page requests, used to time hedges.
+latencies = collections.deque(maxlen=1000)
 
 # Setup logging.
 log_path = config['PATHS']['ERROR_LOG']
@@ -31,7 +47,8 @@ logging.getLogger("urllib3").setLevel(logging.WARNING)
 ##############################################################################
 
 
-def scrape(start=None, end=None, silent=False):
+def scrape(start=None, end=None, silent=False, sparse=False, deadline=None,
+           hedge=False):
     """Returns a pandas DataFrame of school information extracted from the
     website CollegeData.com, with each row corresponding to a successfully
     scraped schoolId in the range [start, stop], inclusive, with each column
@@ -57,10 +74,25 @@ def scrape(start=None, end=None, silent=False):
     silent: boolean, default False
         Suppress success/failure notifications that print for each schoolId,
         as well as any other error messages.
+    sparse: boolean, default False
+        Split the multi-valued list fields (majors, programs of study,
+        degrees and sports) out of the DataFrame into a shared vocabulary and
+        a sparse school-by-item membership matrix. See 'sparse_encode'.
+    deadline: number, optional
+        Seconds (zero or more) after which to stop scraping and return the
+        schoolIds scraped so far. Any request still waiting at the deadline
+        is abandoned.
+    hedge: boolean, default False
+        Send a duplicate request for any page still waiting on a response
+        after the percentile of observed latencies defined in config.json,
+        and use whichever response arrives first.
 
     Returns
     -------
     df : DataFrame
+        If sparse is True, instead returns a tuple of (df, vocabulary, matrix)
+        with the multi-valued columns dropped from df, or (None, None, None)
+        if no schools were scraped.
 
     Examples
     --------
@@ -99,15 +131,27 @@ def scrape(start=None, end=None, silent=False):
 
     start_id, end_id = get_range(start, end)
 
-    s_list = []
+    # Time at which the run stops and returns whatever has been scraped.
+    if deadline is not None and deadline < 0:
+        raise ValueError('deadline must not be negative.')
+    stop_time = time.monotonic() + deadline if deadline is not None else None
+
+    records = {}
     try:
         for school_id in range(start_id, end_id + 1):
-            s = scrape_school(school_id, silent=silent)
-            if s is not None:
-                s_list.append(s)
+            if stop_time is not None and time.monotonic() >= stop_time:
+                raise TimeoutError
+            record = scrape_school(
+                school_id, silent=silent, stop_time=stop_time, hedge=hedge
+            )
+            if record is not None:
+                records[school_id] = record
 
     except KeyboardInterrupt:
         msg = 'Stopped!'
+    except TimeoutError:
+        msg = 'Reached deadline!'
+        logging.warning(msg)
     except IOError:
         msg = 'Invalid start_id and/or stop_id.'
     except Exception as e:
@@ -116,13 +160,20 @@ def scrape(start=None, end=None, silent=False):
     else:
         msg = 'Successfully finished!'
     finally:
-        if s_list:
-            # Create pandas DataFrame from list of Series, and name the index.
-            df = pd.DataFrame(s_list)
+        if records:
+            # pandas is only needed here, so it is imported here: processes
+            # that only run scrape_school never pay for importing it.
+            import pandas as pd
+
+            # Create pandas DataFrame from dict of records; name the index.
+            df = pd.DataFrame.from_dict(records, orient='index')
             df.index = df.index.rename('School ID')
 
+            # Replace None (label with no value) with NaN, like absent labels.
+            df = df.where(df.notna())
+
             # Reorder the DataFrame columns alphabetically.
-            df = df.reindex(columns=sorted(df.columns))
+            df = df.reindex(columns=sorted(df.columns, key=str))
 
             # FUTURE FEATURE
             ##################################################################
@@ -138,50 +189,51 @@ def scrape(start=None, end=None, silent=False):
         else:
             df = None
 
+    # Split multi-valued list fields into a vocabulary and sparse matrix.
+    if sparse:
+        if df is None:
+            return None, None, None
+        from collegedatascraper.encoders import sparse_encode
+        return sparse_encode(df)
+
     return df
 
 
-def scrape_school(school_id, silent=False):
+def scrape_school(school_id, silent=False, stop_time=None, hedge=False):
     """Request the six pages of data associated with a CollegeData.com
-    school_id and return a pandas Series object holding the extracted values.
+    school_id and return a dict of the extracted values keyed by label, with
+    None for missing values. Does not use pandas.
     """
 
     try:
-        # Get DataFrames for the <table> on all six pages for the school_id.
-        df_list = []
+        # Get the values in the <table> tags on all six pages for school_id.
+        record = {}
         for page_id in range(1, 7):
 
             # Request URL for page; convert response to BeautifulSoup object.
-            raw_soup = get_soup(school_id, page_id)
+            raw_soup = get_soup(school_id, page_id, stop_time, hedge)
 
             # Reformat the page structure to make it easier to extract values.
             soup = reformat_soup(raw_soup, page_id)
 
-            # Get pandas DataFrames from <table> in soup; add them to df_list.
-            df_list += pd.read_html(
-                io=soup.decode(),
-                na_values=na_vals,
-                index_col=0)
-
-        # Get a list of Series extracted from each of the DataFrames.
-        s_list = list(map(extract_series, df_list))
-
-        # Merge all Series into one, and sort the index.
-        merged_s = pd.concat(s_list).sort_index()
-
-        # Drop duplicate indices and their vals and name the Series.
-        s = merged_s[~merged_s.index.duplicated()]
-        s.name = school_id
+            # Extract values from <table> in soup; keep the first of any
+            # label already extracted from an earlier page.
+            for key, val in extract_record(soup, na_vals).items():
+                record.setdefault(key, val)
 
+    except TimeoutError:
+        # Let scrape stop the run, as the deadline has been reached.
+        msg = f'Reached deadline while requesting schoolId {school_id}.'
+        raise
     except IOError:
-        s = None
+        record = None
         msg = f'Got anomalous response while requesting schoolId {school_id}.'
         logging.warning(msg)
     except LookupError:
-        s = None
+        record = None
         msg = f'No info exists on CollegeData.com for schoolId {school_id}.'
     except Exception as e:
-        s = None
+        record = None
         msg = f'Exception while requesting schoolId {school_id}!\n{e}'
         logging.critical(msg, exc_info=True)
     else:
@@ -190,7 +242,7 @@ def scrape_school(school_id, silent=False):
         if not silent:
             print(msg)
 
-    return s
+    return record
 
 ##############################################################################
 # INPUT/OUTPUT FUNCTIONS
@@ -227,7 +279,7 @@ def get_range(start_input, end_input):
     return start_id, end_id
 
 
-def get_soup(school_id, page_id):
+def get_soup(school_id, page_id, stop_time=None, hedge=False):
     """Requests a page from CollegeData.com corresponding to the provided
     school_id and page_id and converts the response to a BeautifulSoup object
     """
@@ -236,7 +288,7 @@ def get_soup(school_id, page_id):
     url = url_pt1 + str(page_id) + url_pt2 + str(school_id)
 
     # Request the url and raise exception if something strange returned.
-    response = requests.get(url, headers=headers)
+    response = request_page(url, stop_time, hedge)
     if response.status_code != 200:
         msg = url + ' gave status code ' + response.status_code
         logging.warning(msg)
@@ -266,6 +318,98 @@ def get_soup(school_id, page_id):
     return soup
 
 
+def request_page(url, stop_time=None, hedge=False):
+    """Requests a url within the configured timeouts, optionally hedging slow
+    requests with a duplicate request, and raises TimeoutError if no response
+    has arrived by stop_time.
+    """
+
+    hedge_delay = get_hedge_delay() if hedge else None
+    if stop_time is None and hedge_delay is None:
+        return timed_get(url, get_page_timeout())
+
+    # Threads of abandoned requests are left to end on their own timeouts.
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    try:
+        page_timeout = get_page_timeout(stop_time)
+        futures = [executor.submit(timed_get, url, page_timeout)]
+
+        # Send a duplicate request if the first is slow to respond.
+        if hedge_delay is not None:
+            remaining = get_remaining(stop_time)
+            if remaining is not None:
+                hedge_delay = min(hedge_delay, remaining)
+            done, _ = concurrent.futures.wait(futures, timeout=hedge_delay)
+            if not done:
+                logging.info('Hedging slow request for ' + url)
+                page_timeout = get_page_timeout(stop_time)
+                futures.append(executor.submit(timed_get, url, page_timeout))
+
+        # Return the first response received, or raise if all requests fail.
+        completed = concurrent.futures.as_completed(
+            futures, timeout=get_remaining(stop_time)
+        )
+        for future in completed:
+            try:
+                return future.result()
+            except IOError as e:
+                error = e
+        raise error
+    except concurrent.futures.TimeoutError:
+        raise TimeoutError
+    finally:
+        executor.shutdown(wait=False)
+
+
+def get_page_timeout(stop_time=None):
+    """Get the (connect, read) timeouts for a request, shortened to end by
+    stop_time. Raises TimeoutError if stop_time has passed.
+    """
+
+    remaining = get_remaining(stop_time)
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise TimeoutError
+
+    return tuple(min(seconds, remaining) for seconds in timeout)
+
+
+def get_remaining(stop_time):
+    """Get the seconds left until stop_time, or None if there is none."""
+
+    return stop_time - time.monotonic() if stop_time is not None else None
+
+
+def timed_get(url, page_timeout):
+    """Requests a url and records the latency of the request, including
+    requests that fail or time out, so slow requests count towards hedging.
+    """
+
+    start_time = time.monotonic()
+    try:
+        response = requests.get(url, headers=headers, timeout=page_timeout)
+    finally:
+        latencies.append(time.monotonic() - start_time)
+
+    return response
+
+
+def get_hedge_delay():
+    """Get the configured percentile of recent request latencies, or None
+    if too few requests have completed to estimate it.
+    """
+
+    if len(latencies) < hedge_min_samples:
+        return None
+
+    # Nearest-rank percentile.
+    ordered = sorted(latencies)
+    rank = math.ceil(hedge_percentile / 100 * len(ordered))
+
+    return ordered[max(rank, 1) - 1]
+
+
 def main():
     """This function executes if module is run as a script."""
 
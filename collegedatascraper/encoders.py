@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse
+
+from collegedatascraper.reformatters import list_table_captions
+
+
+def sparse_encode(df, columns=None):
+    """Splits the multi-valued list fields of a scraped DataFrame into a
+    shared vocabulary and a sparse school-by-item membership matrix.
+
+    Parameters
+    ----------
+    df : DataFrame
+        DataFrame returned by 'scrape', indexed by School ID.
+    columns : list, optional
+        Labels of the multi-valued columns to encode. If none provided, uses
+        the '---'-joined list fields and any columns holding tuples.
+
+    Returns
+    -------
+    dense_df : DataFrame
+        The DataFrame with the encoded columns dropped.
+    vocabulary : MultiIndex
+        (Field, Item) pairs labelling the columns of the matrix.
+    matrix : scipy.sparse.csr_matrix
+        Boolean matrix with a row for each row of df and a column for each
+        entry in vocabulary, True where the school lists that item.
+
+    Examples
+    --------
+    Getting the School IDs of all schools offering a particular major.
+
+    >>> dense_df, vocab, matrix = sparse_encode(df)
+    >>> col = vocab.get_loc(('Undergraduate Majors', 'Economics'))
+    >>> dense_df.index[matrix[:, col].nonzero()[0]]
+    """
+
+    if columns is None:
+        columns = get_multival_columns(df)
+
+    # Split every cell of the columns, collecting the row position and
+    # (field, item) key of each item. Empty cells split into no items.
+    rows = []
+    keys = []
+    for field in columns:
+        for row, val in enumerate(df[field].values):
+            for item in split_multival(val):
+                rows.append(row)
+                keys.append((field, item))
+
+    # Build the vocabulary from all schools at once, then map each key to its
+    # column position in the matrix. Building it from arrays rather than
+    # tuples also works when there are no keys.
+    unique_keys = sorted(set(keys))
+    fields = [field for field, _ in unique_keys]
+    items = [item for _, item in unique_keys]
+    vocabulary = pd.MultiIndex.from_arrays(
+        [fields, items], names=['Field', 'Item']
+    )
+    cols = vocabulary.get_indexer(keys) if keys else []
+
+    matrix = scipy.sparse.csr_matrix(
+        (np.ones(len(rows), dtype=bool), (rows, cols)),
+        shape=(len(df), len(vocabulary))
+    )
+
+    dense_df = df.drop(columns=columns)
+
+    return dense_df, vocabulary, matrix
+
+##############################################################################
+# HELPER FUNCTIONS
+##############################################################################
+
+
+def get_multival_columns(df):
+    """Get labels of the '---'-joined list columns and tuple-valued columns."""
+
+    columns = []
+    for col in df.columns:
+        if col in list_table_captions:
+            columns.append(col)
+        elif df[col].map(lambda val: isinstance(val, tuple)).any():
+            columns.append(col)
+
+    return columns
+
+
+def split_multival(val):
+    """Split a '---'-joined string or tuple cell into its unique items."""
+
+    if isinstance(val, tuple):
+        items = val
+    elif isinstance(val, str):
+        items = val.split('---')
+    else:
+        items = ()
+
+    # Drop repeated items while keeping their order.
+    return list(dict.fromkeys(items))
+
+
+def main():
+    """This function executes if module is run as a script."""
+
+
+if __name__ == '__main__':
+    main()
@@ -1,94 +1,382 @@
-import pandas as pd
+import bs4
+import collections
+import re
 
+# Strings pandas.read_html treats as missing in addition to any na_vals.
+default_na_vals = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', 'N/A', 'NA', 'NULL', 'NaN', 'n/a', 'nan', 'null'
+]
 
-def extract_series(df):
-    """Returns a pandas Series of all info extracted from a DataFrame."""
+# Strings pandas.read_html converts to booleans.
+true_vals = ['True', 'TRUE', 'true']
+false_vals = ['False', 'FALSE', 'false']
 
-    # Remove index, value pairs from DataFrame if index is NaN.
-    missing = df.index.isna()
-    missing_idx = df[missing].index
-    df.drop(missing_idx, inplace=True)
+whitespace_regex = re.compile(r'[\r\n]+|\s{2,}')
+nonnumeric_regex = re.compile(r'[^-^0-9^,^.]+')
+number_regex = re.compile(
+    r'[-+]?((\d+\.?\d*|\.\d+)([eE][-+]?\d+)?|inf|infinity)', re.IGNORECASE
+)
+text_types = (bs4.NavigableString, bs4.CData)
 
-    # Extract a Series from a single col DataFrame.
-    if len(df.columns) == 1:
-        s = df.iloc[:, 0]
 
-    # Extract a Series from a wide DataFrame with multiple columns.
-    if len(df.columns) > 1:
-        s = wide_df_to_series(df)
+def extract_record(soup, na_vals=None):
+    """Returns a dict of all info extracted from the <table> tags in a soup,
+    with the same keys and missing values (None) that reading the tables with
+    pandas.read_html and extracting Series from them would give.
+    """
 
-    return s
+    na_set = set(default_na_vals + list(na_vals or []))
+
+    # Like read_html, skip hidden tables and tables without any text.
+    table_tags = [tag for tag in soup.find_all('table')
+                  if not is_hidden(tag, tag.parent) and has_text(tag)]
+    if not table_tags:
+        raise ValueError('No tables found')
+
+    # Cells of every <tfoot> in the soup, used to build the table footers.
+    tfoot_cells = [cell for tfoot_tag in soup.find_all('tfoot')
+                   for cell in tfoot_tag.find_all(['th', 'td'])]
+
+    record = {}
+    for table_tag in table_tags:
+        # Keep the first value found for any label appearing twice.
+        table_record = extract_table(table_tag, tfoot_cells, na_set)
+        for key, val in table_record.items():
+            record.setdefault(key, val)
+
+    return record
+
+
+def extract_table(table_tag, tfoot_cells, na_set):
+    """Returns a dict of all info extracted from one <table> tag."""
+
+    index_name, columns, rows = parse_table(table_tag, tfoot_cells, na_set)
+
+    # Remove label, value rows if the label is missing.
+    rows = [row for row in rows if row[0] is not None]
+
+    # Extract a dict from a table with one column of values. Labels read as
+    # numbers (like years) are keyed by their strings.
+    if len(columns) == 1:
+        record = {}
+        for label, val in rows:
+            record.setdefault(str(label), val)
+
+    # Extract a dict from a wide table with multiple columns.
+    elif len(columns) > 1:
+        record = wide_table_to_record(index_name, columns, rows)
+
+    # A table with only a label column holds no values.
+    else:
+        record = {}
+
+    return record
 
 ##############################################################################
-# EXTRACTING SERIES FROM WIDE DATAFRAMES FUNCTIONS
+# EXTRACTING RECORDS FROM WIDE TABLES FUNCTIONS
 ##############################################################################
 
 
-def wide_df_to_series(df):
-    """Create a single pandas Series from a list of pandas DataFrames objects
-    representing CollegeData.com <table> tags holding multiple columns."""
+def wide_table_to_record(index_name, columns, rows):
+    """Create a single dict from the rows of a CollegeData.com <table> tag
+    holding multiple columns."""
 
-    # There are only four scraped tables from which we want to extract Series.
+    # There are only four scraped tables from which we want to extract dicts.
 
     # These two are both 'traditional' tables with cells having various vals.
-    if df.index.name in ['Subject', 'Exam']:
-        s = multival_wide_df_to_series(df)
+    if index_name in ['Subject', 'Exam']:
+        record = multival_wide_table_to_record(index_name, columns, rows)
 
     # These two both similarly have cell values that 'mark' a row/col label.
-    elif df.index.name in ['Factor', 'Intercollegiate Sports Offered']:
+    elif index_name in ['Factor', 'Intercollegiate Sports Offered']:
 
         # These can be processed the same way if 'Factor' table is flipped:
-        if df.index.name == 'Factor':
-            df = df.T  # Transpose
-            df.index.name = 'Factor'
+        if index_name == 'Factor':
+            labels = [row[0] for row in rows]
+            cols = [[row[i + 1] for row in rows] for i in range(len(columns))]
+            rows = [[col] + vals for col, vals in zip(columns, cols)]
+            columns = labels
 
-        s = singleval_wide_df_to_series(df)  # Returns a tuple of marked vals.
+        # Returns a tuple of marked vals.
+        record = singleval_wide_table_to_record(index_name, columns, rows)
 
         # 'Factor' table should only have one val marked, so we'll extract it.
-        if df.index.name == 'Factor':
-            s = s.str[0]
+        if index_name == 'Factor':
+            record = {key: vals[0] for key, vals in record.items()}
 
     # There is one other table (on the Overview) which is a shortened copy of
     # the 'Factor' table, which we can ignore.
     else:
-        s = None
+        record = {}
 
-    return s
+    return record
 
 
-def multival_wide_df_to_series(df):
-    """Create a pandas Series from a DataFrame with labeled rows and columns
-    and differing values in each 'cell'. The returned Series contains up to
-    m x n values 'cell' values from the DataFrame, each indexed by its former
-    DataFrame row label comma seperated from its column label.
-    label"""
+def multival_wide_table_to_record(index_name, columns, rows):
+    """Create a dict from a table with labeled rows and columns and differing
+    values in each 'cell'. The returned dict contains up to m x n 'cell'
+    values from the table, each keyed by its row label comma seperated from
+    its column label."""
 
-    s = pd.Series()
+    record = {}
 
-    for col in df.columns:
-        col_s = df[col]
-        col_s.index = df.index.name + ', ' + col_s.index + ', ' + col
-        s = s.append(col_s)
+    for i, col in enumerate(columns):
+        for row in rows:
+            key = index_name + ', ' + str(row[0]) + ', ' + str(col)
+            record.setdefault(key, row[i + 1])
 
-    return s
+    return record
 
 
-def singleval_wide_df_to_series(df):
-    """Creates a pandas Series from a DataFrame with labeled rows and columns
-    but only a single value (or null) in each 'cell' - with this value serving
-    to 'mark' a row. The returned Series contains a tuple of all marked row
-    labels indexed by the column names."""
+def singleval_wide_table_to_record(index_name, columns, rows):
+    """Creates a dict from a table with labeled rows and columns but only a
+    single value (or null) in each 'cell' - with this value serving to 'mark'
+    a row. The returned dict contains a tuple of all marked row labels keyed
+    by the column names."""
 
-    s = pd.Series()
+    record = {}
 
-    for col in df.columns:
+    for i, col in enumerate(columns):
         # Use the col label + the table index name as the final 'label'.
-        key = df.index.name + ', ' + col
-        vals = df[col].dropna().index.tolist()  # Marked row label list.
+        key = index_name + ', ' + str(col)
+        vals = [row[0] for row in rows if row[i + 1] is not None]
         if vals:
-            s[key] = tuple(vals)  # Save multiple marked rows as tuple.
+            record[key] = tuple(vals)  # Save multiple marked rows as tuple.
+
+    return record
+
+##############################################################################
+# PARSING TABLES FUNCTIONS
+##############################################################################
+
+
+def parse_table(table_tag, tfoot_cells, na_set):
+    """Split a <table> tag into its index name, column labels, and rows of
+    [label, val, ...] cells the way pandas.read_html(index_col=0) does, with
+    missing cells as None.
+    """
+
+    header = get_header_rows(table_tag)
+    body = header + get_body_rows(table_tag)
+
+    # read_html adds the table footer as one last row. Its query for footer
+    # <td> cells is not limited to the table, so it takes those of every
+    # <tfoot> in the page.
+    footer = [get_text(cell) for cell in tfoot_cells
+              if not is_hidden(cell) and (
+                  cell.name == 'td' or is_descendant(cell, table_tag))]
+    if footer:
+        body.append(footer)
+
+    if not body:
+        return None, [], []
+
+    # Pad the table to be rectangular.
+    width = max(len(row) for row in body)
+    body = [row + [''] * (width - len(row)) for row in body]
+    header, rows = body[:len(header)], body[len(header):]
+
+    index_name, columns, rows = get_labels(header, rows, width)
+
+    # Convert each column, including the row labels, to numbers, booleans or
+    # strings, as read_html does.
+    if rows:
+        cols = [convert_column(col, na_set) for col in zip(*rows)]
+        rows = [list(row) for row in zip(*cols)]
+
+    return index_name, columns, rows
+
+
+def get_header_rows(table_tag):
+    """Get the non-empty rows of cell strings in the first <thead> tag."""
+
+    thead_tag = table_tag.find('thead')
+    if not thead_tag or is_hidden(thead_tag, table_tag):
+        return []
+
+    # A <thead> holding <th> tags directly is a single row.
+    th_tags = [tag for tag in thead_tag.find_all('th', recursive=False)
+               if not is_hidden(tag, table_tag)]
+    if th_tags:
+        rows = [[get_text(tag) for tag in th_tags]]
+    else:
+        rows = [get_cells(tag, table_tag) for tag in thead_tag.find_all('tr')
+                if not is_hidden(tag, table_tag)]
+
+    return [row for row in rows if any(row)]
+
+
+def get_body_rows(table_tag):
+    """Get the rows of cell strings in every <tbody> tag, or in the whole
+    table (including the header rows again) if it has no <tbody>.
+    """
+
+    tbody_tags = table_tag.find_all('tbody')
+    if tbody_tags:
+        tr_tags = [tag for tbody_tag in tbody_tags
+                   for tag in tbody_tag.find_all('tr')]
+    else:
+        tr_tags = table_tag.find_all('tr')
+
+    return [get_cells(tag, table_tag) for tag in tr_tags
+            if not is_hidden(tag, table_tag)]
+
+
+def get_labels(header, rows, width):
+    """Get the index name and column labels pandas gives a table with the
+    given header rows, and the data rows left after any it uses as labels.
+    """
+
+    # Without a header the columns are labeled by position.
+    if not header:
+        return None, list(range(1, width)), rows
+
+    # Empty labels are named 'Unnamed: <position>' and repeated labels are
+    # numbered, like 'Label', 'Label.1'.
+    if len(header) == 1:
+        labels = ['Unnamed: %d' % i if cell == '' else cell
+                  for i, cell in enumerate(header[0])]
+        labels = number_repeated_labels(labels)
+        index_name = None if 'Unnamed' in labels[0] else labels[0]
+        return index_name, labels[1:], rows
+
+    # Multiple header rows give tuple labels, one element per header row.
+    levels = [['Unnamed: %d_level_%d' % (i, level) if cell == '' else cell
+               for i, cell in enumerate(row)]
+              for level, row in enumerate(header)]
+    columns = list(zip(*levels))[1:]
+    for col in columns:
+        if all('Unnamed' in str(label) for label in col):
+            raise ValueError('Too many header rows for the columns')
+
+    # The first data row holds the index name instead, if all but at most
+    # one of its cells are empty.
+    index_name = None
+    if rows:
+        empty_count = rows[0].count('')
+        if empty_count == width or width - 1 <= empty_count:
+            if rows[0][0] != '':
+                index_name = rows[0][0]
+            rows = rows[1:]
+
+    return index_name, columns, rows
+
+
+def number_repeated_labels(labels):
+    """Append '.1', '.2', etc. to repeated labels, as pandas does."""
+
+    counts = collections.defaultdict(int)
+    numbered_labels = []
+
+    for label in labels:
+        count = counts[label]
+        while count > 0:
+            counts[label] = count + 1
+            label = '%s.%d' % (label, count)
+            count = counts[label]
+        numbered_labels.append(label)
+        counts[label] = count + 1
+
+    return numbered_labels
+
+
+def convert_column(cells, na_set):
+    """Convert a column of cell strings the way pandas' TextParser does:
+    to numbers if all values are numeric, else to booleans if all values are
+    'True'/'False' strings, else to strings, with missing values as None.
+    """
+
+    # Strip ',' thousands separators from cells of only digits, '-', ',',
+    # '.' and '^', whatever the other cells in the column hold.
+    cells = [cell.replace(',', '')
+             if ',' in cell and not nonnumeric_regex.search(cell.strip())
+             else cell for cell in cells]
+
+    vals = [None if cell in na_set else cell for cell in cells]
+    present = [val for val in vals if val is not None]
+
+    # Numbers are floats if any are floats or if any values are missing.
+    nums = [to_number(val) for val in present]
+    if None not in nums:
+        if len(nums) < len(vals) or any(type(num) is float for num in nums):
+            nums = [float(num) for num in nums]
+        nums = iter(nums)
+        return [None if val is None else next(nums) for val in vals]
+
+    if all(val in true_vals or val in false_vals for val in present):
+        return [None if val is None else val in true_vals for val in vals]
+
+    return vals
+
+##############################################################################
+# HELPER FUNCTIONS
+##############################################################################
+
+
+def get_cells(tr_tag, table_tag):
+    """Get the strings of the visible <th> and <td> tags in a <tr> tag."""
+
+    return [get_text(tag) for tag in tr_tag.find_all(['th', 'td'])
+            if not is_hidden(tag, table_tag)]
+
+
+def get_text(tag):
+    """Get the whitespace-normalized text of a tag, without any text inside
+    hidden tags."""
+
+    text = ''.join(string for string in tag.find_all(string=True)
+                   if type(string) in text_types
+                   and not is_hidden(string.parent, tag))
+
+    return whitespace_regex.sub(' ', text.strip())
+
+
+def to_number(string):
+    """Convert a numeric string to an int or float, else return None."""
+
+    if not number_regex.fullmatch(string):
+        return None
+
+    try:
+        return int(string)
+    except ValueError:
+        return float(string)
+
+
+def is_hidden(tag, stop_tag=None):
+    """Check if a tag or any of its parents below stop_tag (or, by default,
+    below its nearest <table>) is styled 'display:none'.
+    """
+
+    if stop_tag is None:
+        stop_tag = tag.find_parent('table')
+
+    while tag is not None and tag is not stop_tag:
+        if 'display:none' in tag.get('style', '').replace(' ', ''):
+            return True
+        tag = tag.parent
+
+    return False
+
+
+def is_descendant(tag, ancestor_tag):
+    """Check if a tag is inside ancestor_tag."""
+
+    return any(parent is ancestor_tag for parent in tag.parents)
+
+
+def has_text(table_tag):
+    """Check if any tag in a table starts with text other than newlines."""
+
+    for tag in table_tag.find_all(True):
+        for child in tag.children:
+            if type(child) in text_types:
+                if re.search('.', child):
+                    return True
+                break
 
-    return s
+    return False
 
 
 def main():
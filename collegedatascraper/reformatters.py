@@ -1,6 +1,16 @@
 import bs4
 import re
 
+# Captions of tables holding a list of values, which reformat_labelless_tables
+# joins into a single '---'-separated value labeled by the caption.
+list_table_captions = [
+    'Undergraduate Majors',
+    "Master's Programs of Study",
+    'Doctoral Programs of Study',
+    "Master's Degrees Offered",
+    'Doctoral Degrees Offered'
+]
+
 
 def reformat_soup(soup, page_id):
     """First, do general reformatting, then send the soup to the
@@ -66,14 +76,7 @@ def reformat_labelless_tables(soup):
     """Reformats anomalous tables that are using their <caption> string as
     a 'label' and storing actual data in both <th> and <td> tags.
     """
-    bad_table_captions = [
-        'Undergraduate Majors',
-        "Master's Programs of Study",
-        'Doctoral Programs of Study',
-        "Master's Degrees Offered",
-        'Doctoral Degrees Offered',
-        'Entrance Difficulty'
-    ]
+    bad_table_captions = list_table_captions + ['Entrance Difficulty']
     caption_tags = [tag for tag in soup.find_all('caption')
                     if tag.string in bad_table_captions]
     for caption_tag in caption_tags:
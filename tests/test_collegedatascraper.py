@@ -0,0 +1,220 @@
+import collections
+import threading
+import time
+
+import pytest
+
+from collegedatascraper import collegedatascraper
+
+page = """
+<h1>Test College</h1>
+<div id="tabcontwrap">
+<table><caption>General Information</caption><tbody>
+<tr><th>Campus Setting</th><td>Urban</td></tr>
+</tbody></table>
+</div>
+"""
+
+
+numeric_label_page = """
+<h1>Test College</h1>
+<div id="tabcontwrap">
+<table><caption>Degrees Awarded</caption><tbody>
+<tr><th>2017</th><td>410</td></tr>
+<tr><th>2018</th><td>425</td></tr>
+</tbody></table>
+<table><caption>Enrollment</caption><tbody>
+<tr><th>Freshmen</th><td>500</td></tr>
+</tbody>
+<tfoot><tr><th>Total</th><td>500</td></tr></tfoot></table>
+</div>
+"""
+
+
+class FakeResponse:
+    """Stands in for a successful requests.Response."""
+
+    status_code = 200
+
+    def __init__(self, text=page):
+        self.text = text
+
+
+class FakeGet:
+    """Stands in for requests.get, running one behavior per call in order
+    (repeating the last) and counting the calls made.
+    """
+
+    def __init__(self, *behaviors):
+        self.behaviors = behaviors
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, url, headers=None, timeout=None):
+        with self.lock:
+            last = len(self.behaviors) - 1
+            behavior = self.behaviors[min(self.calls, last)]
+            self.calls += 1
+        return behavior()
+
+
+@pytest.fixture
+def release():
+    """Event that stalled fake requests wait on, set after each test so that
+    abandoned request threads end."""
+
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture(autouse=True)
+def latencies(monkeypatch):
+    """Give each test an empty latency history."""
+
+    samples = collections.deque(maxlen=1000)
+    monkeypatch.setattr(collegedatascraper, 'latencies', samples)
+    return samples
+
+
+def respond_after(seconds, release):
+    def behavior():
+        release.wait(seconds)
+        return FakeResponse()
+    return behavior
+
+
+def fail_after(seconds, release):
+    def behavior():
+        release.wait(seconds)
+        raise IOError('Connection reset')
+    return behavior
+
+
+def stall(release):
+    def behavior():
+        release.wait()
+        raise IOError('Abandoned')
+    return behavior
+
+##############################################################################
+# DEADLINE TESTS
+##############################################################################
+
+
+def test_deadline_returns_partial_result(monkeypatch, release):
+    # School 6 answers all six page requests; school 7 stalls on its first.
+    fake_get = FakeGet(*[respond_after(0, release)] * 6, stall(release))
+    monkeypatch.setattr(collegedatascraper.requests, 'get', fake_get)
+
+    start_time = time.monotonic()
+    df = collegedatascraper.scrape(6, 7, silent=True, deadline=0.5)
+    elapsed = time.monotonic() - start_time
+
+    assert list(df.index) == [6]
+    assert df.loc[6, 'Campus Setting'] == 'Urban'
+    assert 0.5 <= elapsed < 2
+
+
+def test_zero_deadline_scrapes_nothing(monkeypatch, release):
+    fake_get = FakeGet(respond_after(0, release))
+    monkeypatch.setattr(collegedatascraper.requests, 'get', fake_get)
+
+    assert collegedatascraper.scrape(6, 7, silent=True, deadline=0) is None
+    assert fake_get.calls == 0
+
+
+def test_negative_deadline_is_rejected():
+    with pytest.raises(ValueError):
+        collegedatascraper.scrape(6, 7, silent=True, deadline=-1)
+
+def test_scrape_numeric_labels(monkeypatch):
+    # Year labels, and the <td> of the page-wide <tfoot> added to the first
+    # table, are read as numbers but give string columns that sort.
+    fake_get = FakeGet(lambda: FakeResponse(numeric_label_page))
+    monkeypatch.setattr(collegedatascraper.requests, 'get', fake_get)
+
+    df = collegedatascraper.scrape(6, 6, silent=True)
+
+    assert list(df.index) == [6]
+    assert list(df.columns) == [
+        '2017', '2018', '500', 'Freshmen', 'Name', 'Total'
+    ]
+
+##############################################################################
+# HEDGING TESTS
+##############################################################################
+
+
+def test_no_hedge_before_min_samples(monkeypatch, latencies, release):
+    latencies.extend([0.01] * (collegedatascraper.hedge_min_samples - 1))
+    fake_get = FakeGet(respond_after(0.3, release), respond_after(0, release))
+    monkeypatch.setattr(collegedatascraper.requests, 'get', fake_get)
+
+    collegedatascraper.request_page('url', hedge=True)
+
+    assert fake_get.calls == 1
+
+
+def test_no_hedge_for_fast_response(monkeypatch, latencies, release):
+    latencies.extend([1.0] * collegedatascraper.hedge_min_samples)
+    fake_get = FakeGet(respond_after(0, release), respond_after(0, release))
+    monkeypatch.setattr(collegedatascraper.requests, 'get', fake_get)
+
+    collegedatascraper.request_page('url', hedge=True)
+
+    assert fake_get.calls == 1
+
+
+def test_hedge_for_slow_response(monkeypatch, latencies, release):
+    latencies.extend([0.01] * collegedatascraper.hedge_min_samples)
+    fake_get = FakeGet(stall(release), respond_after(0, release))
+    monkeypatch.setattr(collegedatascraper.requests, 'get', fake_get)
+
+    start_time = time.monotonic()
+    response = collegedatascraper.request_page('url', hedge=True)
+
+    assert isinstance(response, FakeResponse)
+    assert fake_get.calls == 2
+    assert time.monotonic() - start_time < 1
+
+
+def test_hedge_survives_one_failed_request(monkeypatch, latencies, release):
+    latencies.extend([0.01] * collegedatascraper.hedge_min_samples)
+    fake_get = FakeGet(fail_after(0.05, release), respond_after(0.1, release))
+    monkeypatch.setattr(collegedatascraper.requests, 'get', fake_get)
+
+    response = collegedatascraper.request_page('url', hedge=True)
+
+    assert isinstance(response, FakeResponse)
+    assert fake_get.calls == 2
+
+
+def test_failed_requests_are_sampled(monkeypatch, latencies, release):
+    fake_get = FakeGet(fail_after(0, release))
+    monkeypatch.setattr(collegedatascraper.requests, 'get', fake_get)
+
+    with pytest.raises(IOError):
+        collegedatascraper.request_page('url')
+
+    assert len(latencies) == 1
+
+
+def test_get_hedge_delay_needs_min_samples(latencies):
+    latencies.extend([1.0] * (collegedatascraper.hedge_min_samples - 1))
+    assert collegedatascraper.get_hedge_delay() is None
+
+    latencies.append(1.0)
+    assert collegedatascraper.get_hedge_delay() == 1.0
+
+
+@pytest.mark.parametrize('percentile, delay', [
+    (95, 19.0), (50, 10.0), (1, 1.0), (100, 20.0)
+])
+def test_get_hedge_delay_nearest_rank(monkeypatch, latencies, percentile,
+                                      delay):
+    monkeypatch.setattr(collegedatascraper, 'hedge_percentile', percentile)
+    monkeypatch.setattr(collegedatascraper, 'hedge_min_samples', 20)
+    latencies.extend(float(n) for n in range(20, 0, -1))
+
+    assert collegedatascraper.get_hedge_delay() == delay
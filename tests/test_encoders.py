@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('scipy')
+
+from collegedatascraper import collegedatascraper  # noqa: E402
+from collegedatascraper.encoders import sparse_encode  # noqa: E402
+
+sports_label = 'Intercollegiate Sports Offered, Women'
+
+
+def get_df():
+    """Get a small scraped DataFrame holding multi-valued list fields."""
+
+    df = pd.DataFrame({
+        'Name': ['A College', 'B College', 'C College'],
+        'Undergraduate Majors': [
+            'Biology---Economics', np.nan, 'Economics---Economics'
+        ],
+        sports_label: [('Golf', 'Tennis'), ('Golf',), np.nan],
+    }, index=[6, 8, 10])
+    df.index.name = 'School ID'
+
+    return df
+
+
+def test_sparse_encode_vocabulary_and_matrix():
+    dense_df, vocab, matrix = sparse_encode(get_df())
+
+    assert list(vocab) == [
+        (sports_label, 'Golf'),
+        (sports_label, 'Tennis'),
+        ('Undergraduate Majors', 'Biology'),
+        ('Undergraduate Majors', 'Economics'),
+    ]
+    assert list(vocab.names) == ['Field', 'Item']
+    assert matrix.format == 'csr'
+    assert matrix.dtype == bool
+    assert matrix.toarray().tolist() == [
+        [True, True, True, True],
+        [True, False, False, False],
+        [False, False, False, True],
+    ]
+
+    # Repeated items in a cell are stored once.
+    assert matrix.nnz == 6
+
+
+def test_sparse_encode_keeps_other_columns_and_index():
+    df = get_df()
+    dense_df, vocab, matrix = sparse_encode(df)
+
+    assert list(dense_df.columns) == ['Name']
+    assert dense_df.index.equals(df.index)
+    assert dense_df.index.name == 'School ID'
+
+    col = vocab.get_loc(('Undergraduate Majors', 'Economics'))
+    assert list(dense_df.index[matrix[:, col].nonzero()[0]]) == [6, 10]
+
+
+def test_sparse_encode_without_multival_columns():
+    df = get_df()[['Name']]
+    dense_df, vocab, matrix = sparse_encode(df)
+
+    assert dense_df.equals(df)
+    assert len(vocab) == 0
+    assert list(vocab.names) == ['Field', 'Item']
+    assert matrix.shape == (3, 0)
+
+
+def test_scrape_sparse_without_schools(monkeypatch):
+    monkeypatch.setattr(
+        collegedatascraper, 'scrape_school', lambda *args, **kwargs: None
+    )
+
+    assert collegedatascraper.scrape(1, 2, sparse=True) == (None, None, None)
@@ -0,0 +1,238 @@
+import io
+import json
+import os
+
+import bs4
+import pytest
+
+from collegedatascraper.extractors import extract_record
+from collegedatascraper.reformatters import reformat_soup
+
+pd = pytest.importorskip('pandas')
+
+config_path = os.path.join(os.path.dirname(__file__), os.pardir, 'config.json')
+with open(config_path, 'r') as f:
+    na_vals = json.load(f)['NA_VALS']
+
+##############################################################################
+# FIXTURES
+##############################################################################
+
+
+pages = {
+    # Single column tables, including gender labels and the city population.
+    1: """
+    <h1>Test College</h1>
+    <div id="tabcontwrap">
+    <p>A small college.</p>
+    <table><caption>General Information</caption><tbody>
+    <tr><th>Web Site</th><td><a href="http://www.test.edu">Visit</a></td></tr>
+    <tr><th>Average GPA</th><td>3.5</td></tr>
+    <tr><th>Population of Springfield</th><td>12,345</td></tr>
+    <tr><th>Campus Setting</th><td>Not reported</td></tr>
+    <tr><th>Undergraduate Students</th><td>2,000 <span>total</span></td></tr>
+    <tr><th>Women</th><td>1,100</td></tr>
+    <tr><th>Men</th><td>900</td></tr>
+    <tr><th>Coed</th><td>True</td></tr>
+    <tr><th></th><td>Unlabeled</td></tr>
+    </tbody></table>
+    <table><caption>Services</caption><tbody>
+    <tr><th>Housing</th><td>True</td></tr>
+    <tr><th>Dining</th><td>False</td></tr>
+    <tr><th>Parking</th><td></td></tr>
+    </tbody></table>
+    </div>
+    """,
+    # Exam and Factor tables, with unnamed and repeated column labels.
+    2: """
+    <h1>Test College</h1>
+    <div id="tabcontwrap">
+    <table><caption>Test Scores</caption>
+    <thead><tr><th>Exam</th><th>Average</th><th></th><th>Range</th>
+    <th>Range</th></tr></thead><tbody>
+    <tr><th>SAT Math</th><td>600</td><td>x</td><td>550</td><td>650</td></tr>
+    <tr><th>ACT Composite</th><td>27</td><td></td><td>24</td><td>30</td></tr>
+    </tbody></table>
+    <table><caption>Selection of Students</caption>
+    <thead><tr><th>Factor</th><th>Very Important</th><th>Important</th>
+    <th>Considered</th></tr></thead><tbody>
+    <tr><th>Rigor of Secondary School Record</th><td>X</td><td></td><td></td>
+    </tr>
+    <tr><th>Essay</th><td></td><td></td><td>X</td></tr>
+    <tr><th>Interview</th><td></td><td></td><td></td></tr>
+    </tbody></table>
+    </div>
+    """,
+    # Subject table and a labelless list table.
+    4: """
+    <h1>Test College</h1>
+    <div id="tabcontwrap">
+    <table><caption>High School Units</caption>
+    <thead><tr><th>Subject</th><th>Required</th><th>Recommended</th></tr>
+    </thead><tbody>
+    <tr><th>English</th><td>4</td><td>4</td></tr>
+    <tr><th>Mathematics</th><td>3</td><td>Not reported</td></tr>
+    </tbody></table>
+    <table><caption>Undergraduate Majors</caption><tbody>
+    <tr><th>Business</th></tr>
+    <tr><td>Accounting</td><td>Finance</td></tr>
+    </tbody></table>
+    </div>
+    """,
+    # Sports table.
+    5: """
+    <h1>Test College</h1>
+    <div id="tabcontwrap">
+    <table><caption>Intercollegiate Sports Offered</caption>
+    <thead><tr><th>Sport</th><th>Women</th><th>Men</th></tr></thead><tbody>
+    <tr><th>Basketball</th><td>X</td><td>X</td><td>X</td><td></td></tr>
+    <tr><th>Golf</th><td></td><td></td><td>X</td><td>X</td></tr>
+    <tr><th>Tennis</th><td>X</td><td></td><td></td><td></td></tr>
+    </tbody></table>
+    </div>
+    """,
+    # Table footer and multiple header rows.
+    6: """
+    <h1>Test College</h1>
+    <div id="tabcontwrap">
+    <table><caption>Enrollment</caption>
+    <thead><tr><th>Level</th><th>Students</th></tr>
+    <tr><th>Term</th><th>Fall</th></tr></thead><tbody>
+    <tr><th>Freshmen</th><td>500</td></tr>
+    <tr><th>Seniors</th><td>450</td></tr>
+    </tbody>
+    <tfoot><tr><th>Total</th><td>950</td></tr></tfoot></table>
+    </div>
+    """
+}
+
+# Labels read as numbers, in a page whose other table has a footer.
+numeric_label_page = """
+<h1>Test College</h1>
+<div id="tabcontwrap">
+<table><caption>Degrees Awarded</caption><tbody>
+<tr><th>2017</th><td>410</td></tr>
+<tr><th>2018</th><td>425</td></tr>
+</tbody></table>
+<table><caption>Enrollment</caption><tbody>
+<tr><th>Freshmen</th><td>500</td></tr>
+</tbody>
+<tfoot><tr><th>Total</th><td>500</td></tr></tfoot></table>
+</div>
+"""
+
+
+def get_reformatted_soup(page_id):
+    """Parse and reformat a fixture page as scrape_school does."""
+
+    soup = bs4.BeautifulSoup(markup=pages[page_id], features='lxml')
+    return reformat_soup(soup, page_id)
+
+##############################################################################
+# BASELINE PANDAS EXTRACTION
+##############################################################################
+
+
+def pandas_record(soup):
+    """Extract values from a soup with pandas, as scrape_school used to."""
+
+    df_list = pd.read_html(
+        io.StringIO(soup.decode()), na_values=na_vals, index_col=0
+    )
+    s_list = list(map(pandas_series, df_list))
+    merged_s = pd.concat(s_list).sort_index()
+    s = merged_s[~merged_s.index.duplicated()]
+
+    # Convert NaN to None and numpy scalars to Python ints, floats and bools.
+    record = {}
+    for key, val in s.items():
+        if not isinstance(val, tuple) and pd.isna(val):
+            val = None
+        record[key] = val.item() if hasattr(val, 'item') else val
+
+    return record
+
+
+def pandas_series(df):
+    """Extract a Series from a DataFrame, as extract_series used to."""
+
+    df = df.drop(df[df.index.isna()].index)
+
+    if len(df.columns) == 1:
+        return df.iloc[:, 0]
+
+    if df.index.name in ['Subject', 'Exam']:
+        s_list = []
+        for col in df.columns:
+            col_s = df[col].astype(object)
+            col_s.index = df.index.name + ', ' + col_s.index + ', ' + col
+            s_list.append(col_s)
+        return pd.concat(s_list)
+
+    if df.index.name in ['Factor', 'Intercollegiate Sports Offered']:
+        name = df.index.name
+        if name == 'Factor':
+            df = df.T
+        marked = {}
+        for col in df.columns:
+            vals = df[col].dropna().index.tolist()
+            if vals:
+                marked[name + ', ' + col] = tuple(vals)
+        s = pd.Series(marked, dtype=object)
+        if name == 'Factor':
+            s = s.str[0]
+        return s
+
+    return None
+
+##############################################################################
+# TESTS
+##############################################################################
+
+
+@pytest.mark.parametrize('page_id', sorted(pages))
+def test_extract_record_matches_pandas(page_id):
+    record = extract_record(get_reformatted_soup(page_id), na_vals)
+    expected = pandas_record(get_reformatted_soup(page_id))
+
+    assert record == expected
+    assert list(map(type, record.values())) == [
+        type(expected[key]) for key in record
+    ]
+
+
+def test_extract_record_values():
+    record = {}
+    for page_id in sorted(pages):
+        soup = get_reformatted_soup(page_id)
+        record.update(extract_record(soup, na_vals))
+
+    assert record['City Population'] == '12345'
+    assert record['Undergraduate Students, Men'] == '900'
+    assert record['Campus Setting'] is None
+    assert record['Housing'] is True
+    assert record['Parking'] is None
+    assert record['Exam, SAT Math, Unnamed: 2'] == 'x'
+    assert record['Exam, ACT Composite, Range.1'] == 30
+    assert record['Factor, Essay'] == 'Considered'
+    assert 'Factor, Interview' not in record
+    assert record['Subject, English, Required'] == 4
+    assert record['Subject, Mathematics, Recommended'] is None
+    assert record['Undergraduate Majors'] == 'Business---Accounting---Finance'
+    assert record['Intercollegiate Sports Offered, Women'] == (
+        'Basketball', 'Tennis'
+    )
+    assert record['Total'] == 950
+
+
+def test_extract_record_numeric_labels():
+    soup = bs4.BeautifulSoup(markup=numeric_label_page, features='lxml')
+    record = extract_record(soup, na_vals)
+
+    assert all(isinstance(key, str) for key in record)
+    assert record['2017'] == 410
+    assert record['2018'] == 425
+    assert record['Total'] == 500
+
+    # The footer's lone <td> cell is also read as a label of the first table.
+    assert record['500'] is None